@@ -4,20 +4,98 @@ instance in an easy and fast way.
 """
 
 import argparse
+import gzip
 import json
 import logging
-from math import ceil
+from concurrent.futures import (FIRST_EXCEPTION, Future, ThreadPoolExecutor,
+                                wait)
+from base64 import b64encode
+from datetime import date, time
+from decimal import Decimal
+from functools import lru_cache
 from os.path import isfile
+from queue import Empty, Queue
 from sys import exit as sys_exit
-from typing import List, Dict
+from threading import BoundedSemaphore, Event, Thread
+from time import perf_counter
+from typing import Any, Dict, Generator, List, Optional, Set, Tuple
+from uuid import UUID
 
 import jsonschema
 import meilisearch
-from jsonschema import validate
-from sqlalchemy import engine, create_engine, MetaData, func, select
+import requests
+from jsonschema import Draft7Validator
+from requests.adapters import HTTPAdapter, Retry
+from sqlalchemy import engine, create_engine, Column, MetaData, Table, text
+from sqlalchemy.pool import QueuePool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 Json = Dict
 
+TARGET_CHUNK_BYTES: int = 16 * 1024 * 1024
+MIN_CHUNK_SIZE: int = 500
+MAX_CHUNK_SIZE: int = 50_000
+
+DB_POOL_SIZE: int = 8
+DB_POOL_MAX_OVERFLOW: int = 8
+DB_POOL_RECYCLE_SECONDS: int = 1800
+
+# (connect, read) timeouts in seconds for requests sent to Meilisearch
+MEILI_TIMEOUT: Tuple[float, float] = (10, 60)
+
+
+def json_default(value: Any) -> Any:
+    """Converts the database values that JSON has no native type for
+    to strings: dates and times as ISO 8601, decimals and UUIDs as their
+    text form and binary data as base64.
+    Raises a TypeError for any other type, so that unsupported columns
+    fail loudly instead of being exported as a meaningless repr
+    """
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return b64encode(value).decode("ascii")
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def load_json_file(file_path: str) -> Json:
+    """Reads and parses a JSON file, with orjson when it is installed"""
+    with open(file_path, "rb") as json_file:
+        contents: bytes = json_file.read()
+    if orjson is not None:
+        return orjson.loads(contents)  # pylint: disable=no-member
+    return json.loads(contents)
+
+
+def encode_document(document: Dict) -> bytes:
+    """Serializes a single document to JSON.
+    orjson is used when it is installed, as it is several times faster
+    than the stdlib json module
+    """
+    if orjson is not None:
+        return orjson.dumps(document, default=json_default)  # pylint: disable=no-member
+    return json.dumps(document, separators=(",", ":"),
+                      default=json_default).encode("utf-8")
+
+
+def encode_documents(documents: List[Dict], ndjson: bool = False) -> bytes:
+    """Serializes a list of documents to either a JSON array
+    or newline delimited JSON
+    """
+    if ndjson:
+        return b"\n".join(map(encode_document, documents))
+    if orjson is not None:
+        return orjson.dumps(documents, default=json_default)  # pylint: disable=no-member
+    return json.dumps(documents, separators=(",", ":"),
+                      default=json_default).encode("utf-8")
+
 
 class DatabaseConn:
     """
@@ -30,6 +108,7 @@ class DatabaseConn:
     tables: List[str]
     database_engine: engine
     metadata: MetaData
+    table_primary_keys: Dict[str, Tuple[Table, str]]
 
     def __init__(
         self,
@@ -48,37 +127,93 @@ class DatabaseConn:
     def connect_to_db(self) -> None:
         """
         Creates an engine that's used to connect to the database
-        and introspects the database
+        and introspects the database.
+        The engine keeps a pool of warm connections that is shared by
+        every export thread, and is only created once per instance
         """
         logging.info("Connecting to SQL database...")
-        self.database_engine = create_engine(self.database_url)
+        if not hasattr(self, "database_engine"):
+            self.database_engine = create_engine(
+                self.database_url,
+                poolclass=QueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_POOL_MAX_OVERFLOW,
+                pool_pre_ping=True,
+                pool_recycle=DB_POOL_RECYCLE_SECONDS,
+            )
         self.metadata = MetaData()
-        self.metadata.reflect(bind=self.database_engine)
+        # Only the configured tables are reflected, a predicate is used
+        # instead of a list so missing tables are reported by validate_tables
+        self.metadata.reflect(
+            bind=self.database_engine,
+            only=lambda table_name, _: table_name in self.tables,
+            views=False,
+        )
+        self.table_primary_keys = {
+            table.name: (table, table.primary_key.columns.values()[0].name)
+            for table in self.metadata.sorted_tables
+            if len(table.primary_key.columns) > 0
+        }
         logging.info("Connected to database at %s",
                      self.database_engine.engine)
 
     def validate_tables(self) -> None:
         """Checks if all the tables defined in the config file
-        exist in the database
+        exist in the database and have a primary key, which is needed
+        to paginate them and to identify their documents in Meilisearch
         """
-        tables_not_present: List = list(
-            filter(lambda tab: tab not in self.metadata.tables, self.tables))
+        tables_not_present: List = [
+            table for table in self.tables
+            if table not in self.metadata.tables
+        ]
         if len(tables_not_present) > 0:
             raise KeyError(
                 f"The following tables do not exist in the database: {tables_not_present}"
             )
+        tables_without_primary_key: List = [
+            table for table in self.tables
+            if table not in self.table_primary_keys
+        ]
+        if len(tables_without_primary_key) > 0:
+            raise KeyError(
+                f"The following tables do not have a primary key: {tables_without_primary_key}"
+            )
 
-    def get_primary_key_name(self, table_name: str):
+    def estimate_row_count(self, table_name: str) -> Optional[int]:
+        """Gets the approximate number of rows of a given table from the
+        database statistics, which unlike COUNT(*) doesn't scan the table.
+        Returns None if the database doesn't provide an estimate
+        """
+        dialect: str = self.database_engine.dialect.name
+        if dialect == "postgresql":
+            statement = text("SELECT reltuples::bigint FROM pg_class "
+                             "WHERE oid = CAST(:table_name AS regclass)")
+            # regclass folds unquoted names to lower case
+            preparer = self.database_engine.dialect.identifier_preparer
+            table_name = preparer.quote(table_name)
+        elif dialect == "mysql":
+            statement = text("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                             "WHERE TABLE_SCHEMA = DATABASE() "
+                             "AND TABLE_NAME = :table_name")
+        else:
+            return None
+        with self.database_engine.connect() as conn:
+            estimate = conn.execute(statement, table_name=table_name).scalar()
+        # Postgres reports -1 for tables that have never been analyzed
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    def get_table(self, table_name: str) -> Table:
+        """Gets the reflected table object of a given table"""
+        return self.table_primary_keys[table_name][0]
+
+    def get_primary_key_name(self, table_name: str) -> str:
         """Gets the name of the first primary key of a given table
         As far as I know, MeiliSearch only supports one primary key
         Will be updated to support more than one if needed
         """
-        return next(
-            map(
-                lambda tab: tab.primary_key.columns.values()[0].name,
-                filter(lambda tb: tb.name == table_name,
-                       self.metadata.sorted_tables),
-            ))
+        return self.table_primary_keys[table_name][1]
 
 
 class MeilisearchConn:
@@ -88,25 +223,121 @@ class MeilisearchConn:
     Meilisearch connection
     """
 
+    host: str
+    api_key: str
     indexes: List[str]
     meilisearch_client: meilisearch.Client
-
-    def __init__(self, host: str, api_key: str, indexes: List[str]) -> None:
+    upload_concurrency: int
+    upload_pool: ThreadPoolExecutor
+    session: requests.Session
+    auth_headers: Dict[str, str]
+    ndjson: bool
+    compress: bool
+
+    def __init__(self,
+                 host: str,
+                 api_key: str,
+                 indexes: List[str],
+                 upload_concurrency: int = 4,
+                 ndjson: bool = False,
+                 compress: bool = False) -> None:
+        self.host = host.rstrip("/")
+        self.api_key = api_key
         self.indexes = indexes
         self.meilisearch_client = meilisearch.Client(host, api_key)
+        self.upload_concurrency = upload_concurrency
+        self.upload_pool = ThreadPoolExecutor(max_workers=upload_concurrency)
+        # A single session keeps connections alive between uploads, with
+        # one pooled connection per upload thread, and retries uploads
+        # that fail or time out while Meilisearch is briefly unavailable
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_maxsize=upload_concurrency,
+            max_retries=Retry(total=3,
+                              backoff_factor=0.5,
+                              status_forcelist=[502, 503, 504]),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Meilisearch replaced X-Meili-Api-Key with a bearer token in 0.25,
+        # both are sent so requests work on either side of it
+        self.auth_headers = {
+            "X-Meili-Api-Key": api_key,
+            "Authorization": f"Bearer {api_key}",
+        }
+        self.ndjson = ndjson
+        self.compress = compress
 
     def upload_data_to_index(self, index: str, data: List[Dict],
-                             primary_key: str):
+                             primary_key: str) -> Future:
         """
-        Uploads a list to an index
+        Uploads a list to an index in the background, at most
+        upload_concurrency uploads run at the same time
         :param index: Name of the index to upload the table to
         :param data: List of dicts containing the data to be uploaded
         :param primary_key: Primary key of the index
+        :return: Future that resolves once Meilisearch accepted the upload
+        """
+        def upload() -> None:
+            # The documents are encoded here instead of going through
+            # Index.update_documents, which always serializes with the
+            # stdlib json module and fails on dates and decimals
+            body: bytes = encode_documents(data, self.ndjson)
+            content_type: str = ("application/x-ndjson"
+                                 if self.ndjson else "application/json")
+            headers: Dict[str, str] = {
+                **self.auth_headers,
+                "Content-Type": content_type,
+            }
+            if self.compress:
+                # Field names repeat in every document, so even the fastest
+                # compression level shrinks the payload considerably
+                body = gzip.compress(body, compresslevel=1)
+                headers["Content-Encoding"] = "gzip"
+            response = self.session.put(
+                f"{self.host}/indexes/{index}/documents",
+                params={"primaryKey": primary_key},
+                data=body,
+                headers=headers,
+                timeout=MEILI_TIMEOUT,
+            )
+            response.raise_for_status()
+            logging.info("Exported %d rows to Meilisearch index %s",
+                         len(data), index)
+
+        return self.upload_pool.submit(upload)
+
+    def get_index_uids(self) -> Set[str]:
+        """Gets the uids of all the indexes in the Meilisearch instance.
+        The request goes through the upload session rather than the
+        client, so that it is authenticated the same way as uploads.
+        Meilisearch >= 0.28 paginates the index list, older versions
+        return it as a plain list
         """
-        self.meilisearch_client.get_index(index).update_documents(
-            data, primary_key=primary_key)
-        logging.info("Exported %d rows to Meilisearch index %s", len(data),
-                     index)
+        uids: Set[str] = set()
+        params: Dict[str, int] = {}
+        while True:
+            response = self.session.get(f"{self.host}/indexes",
+                                        params=params,
+                                        headers=self.auth_headers,
+                                        timeout=MEILI_TIMEOUT)
+            response.raise_for_status()
+            page = response.json()
+            if isinstance(page, list):
+                return {index["uid"] for index in page}
+            uids.update(index["uid"] for index in page["results"])
+            if not page["results"] or len(uids) >= page["total"]:
+                return uids
+            params = {
+                "offset": page["offset"] + len(page["results"]),
+                "limit": page["limit"],
+            }
+
+    def close(self) -> None:
+        """Waits for any pending uploads and releases the upload threads
+        and connections"""
+        self.upload_pool.shutdown(wait=True)
+        self.session.close()
 
     def validate_indexes(self, db_con: DatabaseConn):
         """
@@ -128,15 +359,10 @@ class MeilisearchConn:
             for table in db_con.tables[len(db_con.tables) - diff:]:
                 self.indexes.append(table)
 
-        indexes_not_present: List = list(
-            filter(
-                lambda idx: idx not in list(
-                    map(
-                        lambda index: index["uid"],
-                        self.meilisearch_client.get_indexes(),
-                    )),
-                self.indexes,
-            ))
+        remote_indexes: Set[str] = self.get_index_uids()
+        indexes_not_present: List = [
+            index for index in self.indexes if index not in remote_indexes
+        ]
         if len(indexes_not_present) > 0:
             raise KeyError(
                 f"The following indexes are not present in Meilisearch: {indexes_not_present}"
@@ -144,7 +370,11 @@ class MeilisearchConn:
 
 
 def create_connection_from_dict(
-        json_data: Json, schema_path: str) -> (DatabaseConn, MeilisearchConn):
+        json_data: Json,
+        schema_path: str,
+        upload_concurrency: int = 4,
+        ndjson: bool = False,
+        compress: bool = False) -> (DatabaseConn, MeilisearchConn):
     """
     This function validates the configuration data against a schema
     and if it is successful, instantiates a DatabaseConn and a
@@ -154,72 +384,263 @@ def create_connection_from_dict(
     """
     validate_json(json_data, schema_path)
     database: DatabaseConn = DatabaseConn(**json_data["database"])
-    meili: MeilisearchConn = MeilisearchConn(**json_data["meilisearch"])
+    meili: MeilisearchConn = MeilisearchConn(
+        **json_data["meilisearch"],
+        upload_concurrency=upload_concurrency,
+        ndjson=ndjson,
+        compress=compress)
     database.connect_to_db()
     meili.validate_indexes(database)
     database.validate_tables()
     return database, meili
 
 
+@lru_cache(maxsize=1)
 def get_schema(schema_path: str) -> Json:
-    """Loads the schema from a file and returns it"""
-    with open(schema_path, "r") as schema_file:
-        schema: Json = json.load(schema_file)
+    """Loads the schema from a file and returns it
+    The schema is cached, so the file is only read once per path
+    """
+    schema: Json = load_json_file(schema_path)
     if not schema:
         raise ValueError("Schema file was empty or failed to open.")
     return schema
 
 
-def validate_json(json_data: Json, schema_path: str) -> None:
-    """Validates a Json dict against the schema"""
+@lru_cache(maxsize=1)
+def get_validator(schema_path: str) -> Draft7Validator:
+    """Checks the schema and builds a validator for it
+    The validator is cached so it can be reused across validations
+    """
     script_schema: Json = get_schema(schema_path)
+    Draft7Validator.check_schema(script_schema)
+    return Draft7Validator(script_schema)
+
+
+def validate_json(json_data: Json, schema_path: str) -> None:
+    """Validates a Json dict against the schema
+    Raises a ValidationError if the data does not match it
+    """
+    get_validator(schema_path).validate(json_data)
+
+
+def get_chunk_size(document: Dict) -> int:
+    """Picks how many rows to export per chunk based on the encoded size
+    of a sample document, so that every chunk is roughly TARGET_CHUNK_BYTES
+    """
+    document_size: int = max(len(encode_document(document)), 1)
+    return max(MIN_CHUNK_SIZE,
+               min(MAX_CHUNK_SIZE, TARGET_CHUNK_BYTES // document_size))
+
+
+def fetch_page(conn: engine.Connection, table: Table, primary_key: Column,
+               last_key: Any, limit: int) -> List[Dict]:
+    """Fetches up to limit rows of a table, ordered by its primary key,
+    that come after last_key.
+    Pages are bounded by the LIMIT, so they are read with a plain cursor
+    in a single round trip rather than streamed in growing batches
+    """
+    statement = table.select().order_by(primary_key).limit(limit)
+    if last_key is not None:
+        statement = statement.where(primary_key > last_key)
+    result = conn.execute(statement)
+    # SQLAlchemy returns the column names as quoted_name, a str subclass
+    # that orjson refuses to use as a dict key
+    columns: List[str] = [str(key) for key in result.keys()]
+    return [dict(zip(columns, row)) for row in result.fetchall()]
+
+
+def fetch_table_chunks(
+        db_con: DatabaseConn, table_name: str,
+        max_chunk_size: Optional[int]) -> Generator[List[Dict], None, None]:
+    """Yields the rows of a table as lists of at most max_chunk_size dicts.
+    If max_chunk_size is None it is picked from the size of the first row.
+    Tables are paginated on their primary key (keyset pagination) so every
+    chunk is a cheap index seek instead of an OFFSET scan, and only
+    a single chunk is held in memory at any given time
+    """
+    table: Table = db_con.get_table(table_name)
+    primary_key_name: str = db_con.get_primary_key_name(table_name)
+    primary_key: Column = table.c[primary_key_name]
+    last_key = None
+    values: List = []
+    with db_con.database_engine.connect() as conn:
+        if max_chunk_size is None:
+            values = fetch_page(conn, table, primary_key, None, 1)
+            if not values:
+                return
+            max_chunk_size = get_chunk_size(values[0])
+            logging.info("Exporting table %s in chunks of %d rows",
+                         table_name, max_chunk_size)
+            last_key = values[-1][primary_key_name]
+        while True:
+            limit: int = max_chunk_size - len(values)
+            page: List = fetch_page(conn, table, primary_key, last_key, limit)
+            values.extend(page)
+            if values:
+                yield values
+            if len(page) < limit:
+                break
+            last_key = values[-1][primary_key_name]
+            values = []
+
+
+def prefetch_chunks(chunks: Generator[List[Dict], None, None], depth: int,
+                    chunk_slots: BoundedSemaphore
+                    ) -> Generator[List[Dict], None, None]:
+    """Consumes a chunk generator on a background thread, keeping up to
+    depth chunks ready so that the database fetch of the next chunk
+    overlaps with the upload of the current one.
+    A slot of chunk_slots is taken before fetching each chunk and is
+    owned by the caller once the chunk is yielded, so it has to be
+    released when the caller is done with the chunk.
+    Exceptions raised while fetching are re-raised in the caller
+    """
+    buffer: Queue = Queue(maxsize=depth)
+    stop: Event = Event()
+
+    def produce() -> None:
+        try:
+            while not stop.is_set():
+                if not chunk_slots.acquire(timeout=0.1):
+                    continue
+                try:
+                    chunk: Optional[List[Dict]] = next(chunks, None)
+                except Exception:
+                    chunk_slots.release()
+                    raise
+                if chunk is None:
+                    chunk_slots.release()
+                    break
+                buffer.put(chunk)
+            buffer.put(None)
+        except Exception as error:  # pylint: disable=broad-except
+            buffer.put(error)
+        finally:
+            chunks.close()
+
+    producer: Thread = Thread(target=produce, daemon=True)
+    producer.start()
     try:
-        validate(instance=json_data, schema=script_schema)
-    except jsonschema.exceptions.ValidationError as error:
-        logging.critical(error)
+        while True:
+            item = buffer.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Drain the queue so a producer blocked on a full buffer can exit,
+        # giving back the slots of the chunks that will never be uploaded
+        while producer.is_alive() or not buffer.empty():
+            try:
+                item = buffer.get(timeout=0.1)
+            except Empty:
+                continue
+            if isinstance(item, list):
+                chunk_slots.release()
+
+
+def export_table(db_con: DatabaseConn, meili: MeilisearchConn,
+                 table_name: str, meili_index: str,
+                 max_chunk_size: Optional[int], prefetch_depth: int,
+                 chunk_slots: BoundedSemaphore, stop: Event) -> None:
+    """Exports a single table to a MeiliSearch index.
+    Chunks are fetched from the database on a separate thread while
+    the previous ones are being uploaded, and each chunk holds a slot of
+    chunk_slots from the moment it starts being fetched until it has
+    been uploaded.
+    The export stops early once stop is set, and sets it itself when
+    one of its uploads fails
+    """
+    estimated_rows: Optional[int] = db_con.estimate_row_count(table_name)
+    if estimated_rows is None:
+        logging.info("Starting the export of table %s", table_name)
+    else:
+        logging.info("Starting the export of table %s (~%d rows)", table_name,
+                     estimated_rows)
+    started: float = perf_counter()
+    primary_key_name: str = db_con.get_primary_key_name(table_name)
+    uploads: List[Future] = []
+    stopped: bool = False
+
+    def stop_on_failure(upload: Future) -> None:
+        if upload.exception() is not None:
+            stop.set()
+
+    for values in prefetch_chunks(
+            fetch_table_chunks(db_con, table_name, max_chunk_size),
+            prefetch_depth, chunk_slots):
+        if stop.is_set():
+            chunk_slots.release()
+            stopped = True
+            break
+        try:
+            upload: Future = meili.upload_data_to_index(
+                meili_index, values, primary_key_name)
+        except BaseException:
+            chunk_slots.release()
+            raise
+        upload.add_done_callback(lambda _: chunk_slots.release())
+        upload.add_done_callback(stop_on_failure)
+        uploads.append(upload)
+    for upload in uploads:
+        upload.result()
+    if stopped:
+        logging.warning("Stopped the export of table %s after %.2fs",
+                        table_name, perf_counter() - started)
+        return
+    logging.info("Finished exporting table %s to index %s in %.2fs",
+                 table_name, meili_index, perf_counter() - started)
 
 
 def export_tables(db_con: DatabaseConn, meili: MeilisearchConn,
-                  max_chunk_size: int) -> None:
+                  max_chunk_size: Optional[int], prefetch_depth: int) -> None:
     """Exports all the tables to their respective MeiliSearch indexes in chunks of
-    5000 elements at a time"""
-    for idx, table_name in enumerate(db_con.tables):
-        logging.info("Starting the export of table %s", table_name)
-        primary_key_name: str = db_con.get_primary_key_name(table_name)
-        meili_index: str = meili.indexes[idx]
-        total_size: int = db_con.database_engine.execute(
-            select([func.count()]).select_from(
-                db_con.metadata.tables[table_name])).scalar()
-        if total_size < max_chunk_size:
-            values: List = [
-                dict(row) for row in db_con.database_engine.execute(
-                    db_con.metadata.tables[table_name].select())
-            ]
-            meili.upload_data_to_index(meili_index, values, primary_key_name)
-        else:
-            chunks: int = ceil(total_size / max_chunk_size)
-            for chunk in range(chunks):
-                values: List = [
-                    dict(row) for row in db_con.database_engine.execute(
-                        select(["*"]).select_from(
-                            db_con.metadata.tables[table_name]).order_by(primary_key_name).offset(
-                                chunk * max_chunk_size).limit(max_chunk_size))
-                ]
-                meili.upload_data_to_index(meili_index, values,
-                                           primary_key_name)
-        logging.info("Finished exporting table %s to index %s", table_name,
-                     meili_index)
+    max_chunk_size elements at a time, or of a size picked per table
+    from its row size if max_chunk_size is None.
+    Tables are exported concurrently, each one on its own database
+    connection, with at most as many tables at once as the size of
+    the database connection pool.
+    No matter how many tables are exported at once, at most
+    prefetch_depth + upload_concurrency chunks are held in memory.
+    The first table that fails stops all the others
+    """
+    chunk_slots: BoundedSemaphore = BoundedSemaphore(
+        prefetch_depth + meili.upload_concurrency)
+    stop: Event = Event()
+    with ThreadPoolExecutor(
+            max_workers=max(1, min(len(db_con.tables),
+                                   DB_POOL_SIZE))) as pool:
+        exports: List[Future] = [
+            pool.submit(export_table, db_con, meili, table_name,
+                        meili.indexes[idx], max_chunk_size, prefetch_depth,
+                        chunk_slots, stop)
+            for idx, table_name in enumerate(db_con.tables)
+        ]
+        wait(exports, return_when=FIRST_EXCEPTION)
+        stop.set()
+        for export in exports:
+            export.cancel()
+        for export in exports:
+            if not export.cancelled():
+                export.result()
 
 
 def run_with_config_file(file_path: str, schema_path: str,
-                         max_chunk_size: int):
+                         max_chunk_size: Optional[int], prefetch_depth: int,
+                         upload_concurrency: int, ndjson: bool,
+                         compress: bool):
     """Loads the configuration from a given path,
     and runs the export process
     """
-    with open(file_path) as json_file:
-        data: Json = json.load(json_file)
-        db_conn, meili_conn = create_connection_from_dict(data, schema_path)
-        export_tables(db_conn, meili_conn, max_chunk_size)
+    data: Json = load_json_file(file_path)
+    db_conn, meili_conn = create_connection_from_dict(
+        data, schema_path, upload_concurrency, ndjson, compress)
+    try:
+        export_tables(db_conn, meili_conn, max_chunk_size, prefetch_depth)
+    finally:
+        meili_conn.close()
     logging.info("Finished exporting all tables to Meilisearch")
     logging.info(
         "You can browse the exported data at %s",
@@ -261,17 +682,60 @@ def main():
         dest="chunk_size",
         metavar="CHUNK_SIZE",
         action="store",
-        help="Specifies the max number of rows to export in a single chunk",
+        help="Specifies the max number of rows to export in a single chunk, "
+        "picked from the size of the rows by default",
+        required=False,
+        type=int,
+    )
+    parser.add_argument(
+        "-pd",
+        "--prefetch_depth",
+        dest="prefetch_depth",
+        metavar="PREFETCH_DEPTH",
+        action="store",
+        help="Specifies how many chunks to fetch ahead while uploading",
+        required=False,
+        type=int,
+    )
+    parser.add_argument(
+        "-uc",
+        "--upload_concurrency",
+        dest="upload_concurrency",
+        metavar="UPLOAD_CONCURRENCY",
+        action="store",
+        help="Specifies how many chunks can be uploaded to Meilisearch at once",
         required=False,
         type=int,
     )
+    parser.add_argument(
+        "-nd",
+        "--ndjson",
+        dest="ndjson",
+        action="store_true",
+        help="Uploads chunks as newline delimited JSON (Meilisearch >= 0.23)",
+        required=False,
+    )
+    parser.add_argument(
+        "-gz",
+        "--gzip",
+        dest="gzip",
+        action="store_true",
+        help="Compresses the uploaded chunks with gzip (Meilisearch >= 0.27)",
+        required=False,
+    )
     args = parser.parse_args()
     file_path: str = args.path
     schema_path: str = "schema.json"
-    max_chunk_size: int = 5000
+    max_chunk_size: Optional[int] = None
+    prefetch_depth: int = 2
+    upload_concurrency: int = 4
 
     if args.chunk_size:
         max_chunk_size = args.chunk_size
+    if args.prefetch_depth:
+        prefetch_depth = args.prefetch_depth
+    if args.upload_concurrency:
+        upload_concurrency = args.upload_concurrency
     if args.schema:
         schema_path = args.schema
 
@@ -283,7 +747,13 @@ def main():
         logging.critical("Specified config file path is not a valid file!")
         sys_exit(2)
 
-    run_with_config_file(file_path, schema_path, max_chunk_size)
+    try:
+        run_with_config_file(file_path, schema_path, max_chunk_size,
+                             prefetch_depth, upload_concurrency, args.ndjson,
+                             args.gzip)
+    except jsonschema.exceptions.ValidationError as error:
+        logging.critical("Invalid configuration: %s", error.message)
+        sys_exit(2)
 
 
 if __name__ == "__main__":